@@ -12,11 +12,11 @@ def ground_truth_estimate(filename):
         j = 0
         for i in s:
             if j == 1:
-                c1 = np.fromstring(i, dtype=np.float, sep=",")
+                c1 = np.fromstring(i, dtype=float, sep=",")
             elif j == 2:
-                c2 = np.fromstring(i, dtype=np.float, sep=",")
+                c2 = np.fromstring(i, dtype=float, sep=",")
             elif j == 3:
-                c3 = np.fromstring(i, dtype=np.float, sep=",")
+                c3 = np.fromstring(i, dtype=float, sep=",")
             j = j + 1
         return c1, c2, c3
 
@@ -8,7 +8,8 @@ power production data sets. The algorithm works as follows:
       constant component
     - Polish the L1 heuristic used to estimate piecewise constant component
       using iterative reweighting
-    - Assign daily cluster labels using DBSCAN algorithm
+    - Assign daily cluster labels by rounding the piecewise constant component
+      to the nearest 0.05 and indexing the unique levels
 
 
 
@@ -16,7 +17,37 @@ power production data sets. The algorithm works as follows:
 
 import numpy as np
 from solardatatools.signal_decompositions import l1_l1d1_l2d2p365
-from sklearn.cluster import DBSCAN
+
+
+def _daily_quantile(data, q):
+    """Column-wise quantile of a 2D power matrix, ignoring NaNs
+
+    Equivalent to ``np.nanquantile(data, q=q, axis=0)`` with linear
+    interpolation, but avoids the per-column Python iteration that numpy falls
+    back on for NaN-aware quantiles. The extreme quantiles reduce to a plain
+    ``nanmax``/``nanmin``; everything else is a single sort along the first
+    axis (NaNs sort to the end of each column) followed by a gather.
+
+    :param data: 2D array with shape (measurements per day, days)
+    :param q: quantile to compute, between 0 and 1
+    :return: 1D array with one value per day (column)
+    """
+    # Match the float output of np.nanquantile for integer input
+    data = np.asarray(data, dtype=float)
+    if q == 1.0:
+        return np.nanmax(data, axis=0)
+    if q == 0.0:
+        return np.nanmin(data, axis=0)
+    sorted_data = np.sort(data, axis=0)
+    n_valid = np.sum(~np.isnan(data), axis=0)
+    position = q * np.maximum(n_valid - 1, 0)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    lower_vals = np.take_along_axis(sorted_data, lower[None, :], axis=0)[0]
+    upper_vals = np.take_along_axis(sorted_data, upper[None, :], axis=0)[0]
+    metric = lower_vals + (position - lower) * (upper_vals - lower_vals)
+    metric[n_valid == 0] = np.nan
+    return metric
 
 
 class CapacityChange:
@@ -39,7 +70,7 @@ class CapacityChange:
         if filter is None:
             filter = np.ones(data.shape[1], dtype=bool)
         if np.sum(filter) > 0:
-            metric = np.nanquantile(data, q=quantile, axis=0)
+            metric = _daily_quantile(data, quantile)
             metric /= np.max(metric)
 
             s1, s2, s3 = l1_l1d1_l2d2p365(
@@ -55,8 +86,7 @@ class CapacityChange:
             return np.round(base * np.round(x / base), ndigits)
 
         rounded_s1 = custom_round(s1)
-        set_labels = list(set(rounded_s1))
-        capacity_assignments = [set_labels.index(i) for i in rounded_s1]
+        _, capacity_assignments = np.unique(rounded_s1, return_inverse=True)
 
         self.metric = metric
         self.s1 = s1  # pwc
@@ -53,7 +53,7 @@ class ShadeAnalysis:
 
     @property
     def has_run(self):
-        state = np.alltrue(
+        state = np.all(
             [
                 self.data_normalized is not None,
                 self.data_transformed is not None,
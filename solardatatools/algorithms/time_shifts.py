@@ -16,7 +16,6 @@ The algorithm works as follows:
 """
 
 import numpy as np
-from sklearn.model_selection import train_test_split
 import matplotlib.pyplot as plt
 from solardatatools.solar_noon import energy_com, avg_sunrise_sunset
 from solardatatools.signal_decompositions import l2_l1d1_l2d2p365
@@ -145,9 +144,7 @@ class TimeShift:
             )
             return
         # Apply corrections
-        my_set = set(s1)
-        key_func = lambda x: abs(x - 12)
-        closest_element = min(my_set, key=key_func)
+        closest_element = s1[np.argmin(np.abs(s1 - 12))]
         if not round_shifts_to_hour:
             roll_by_index = np.round((closest_element - s1) * data.shape[0] / 24, 0)
         else:
@@ -183,10 +180,13 @@ class TimeShift:
     def optimize_w1(
         self, metric, w1s, use_ixs, w2, periodic_detector, solver=None, sum_card=False
     ):
-        # set up train/test split with sklearn
+        # set up random 85/15 train/test split (same split as sklearn's
+        # train_test_split for a given numpy random state)
         ixs = np.arange(len(metric))
         ixs = ixs[use_ixs]
-        train_ixs, test_ixs = train_test_split(ixs, train_size=0.85)
+        n_test = len(ixs) - int(np.floor(0.85 * len(ixs)))
+        ixs = ixs[np.random.permutation(len(ixs))]
+        train_ixs, test_ixs = ixs[n_test:], ixs[:n_test]
         train = np.zeros(len(metric), dtype=bool)
         test = np.zeros(len(metric), dtype=bool)
         train[train_ixs] = True
@@ -295,7 +295,7 @@ class TimeShift:
         for roll in np.unique(roll_by_index):
             if roll != 0:
                 ixs = roll_by_index == roll
-                Dout[:, ixs] = np.roll(data, int(roll), axis=0)[:, ixs]
+                Dout[:, ixs] = np.roll(data[:, ixs], int(roll), axis=0)
         return Dout
 
     def invert_corrections(self, data):
@@ -304,5 +304,5 @@ class TimeShift:
         for roll in np.unique(roll_by_index):
             if roll != 0:
                 ixs = roll_by_index == roll
-                Dout[:, ixs] = np.roll(data, -int(roll), axis=0)[:, ixs]
+                Dout[:, ixs] = np.roll(data[:, ixs], -int(roll), axis=0)
         return Dout
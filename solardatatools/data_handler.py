@@ -974,24 +974,16 @@ time zone errors     {report['time zone correction'] != 0}
         )
         # Count the number of days that cluster to the main group but fall
         # outside the decision boundaries
-        day_counts = [
+        outside_bounds = np.logical_or(
+            self.daily_scores.linearity > linearity_threshold,
             np.logical_or(
-                self.daily_scores.linearity[db.labels_ == lb] > linearity_threshold,
-                np.logical_or(
-                    self.daily_scores.density[db.labels_ == lb]
-                    < density_lower_threshold,
-                    self.daily_scores.density[db.labels_ == lb]
-                    > density_upper_threshold,
-                ),
-            )
-            for lb in set(db.labels_)
-        ]
-        self.normal_quality_scores = np.any(
-            [
-                np.sum(day_count) <= max(5e-3 * self.num_days, 1)
-                for day_count in day_counts
-            ]
+                self.daily_scores.density < density_lower_threshold,
+                self.daily_scores.density > density_upper_threshold,
+            ),
         )
+        _, cluster_ixs = np.unique(db.labels_, return_inverse=True)
+        day_counts = np.bincount(cluster_ixs, weights=outside_bounds)
+        self.normal_quality_scores = np.any(day_counts <= max(5e-3 * self.num_days, 1))
         self.__density_lower_threshold = density_lower_threshold
         self.__density_upper_threshold = density_upper_threshold
         self.__linearity_threshold = linearity_threshold
@@ -13,6 +13,7 @@ from solardatatools.time_axis_manipulation import (
 from solardatatools.utilities import progress
 
 from time import time, perf_counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import StringIO, BytesIO
 import base64
 import os
@@ -22,8 +23,12 @@ import numpy as np
 import pandas as pd
 from typing import Callable, TypedDict, Any, Tuple, Dict
 from functools import wraps
+import threading
 from datetime import datetime
 import zlib
+from importlib.util import find_spec
+
+_PYARROW_AVAILABLE = find_spec("pyarrow") is not None
 
 
 def get_pvdaq_data(sysid=2, api_key="DEMO_KEY", year=2011, delim=",", standardize=True):
@@ -39,22 +44,45 @@ def get_pvdaq_data(sysid=2, api_key="DEMO_KEY", year=2011, delim=",", standardiz
         year = [int(yr) for yr in year]
     else:
         year = [year]
-    # Each year must queries separately, so iterate over the years and generate a list of dataframes.
-    df_list = []
-    it = 0
-    for yr in year:
-        progress(it, len(year), "querying year {}".format(year[it]))
+    # Use the multithreaded pyarrow CSV parser when it is available
+    csv_engine = "pyarrow" if _PYARROW_AVAILABLE else "c"
+
+    # Each year must be queried separately. The requests are network bound, so
+    # query the years concurrently and collect the yearly data frames in order.
+    def query_year(yr):
         req_params = {"api_key": api_key, "system_id": sysid, "year": yr}
         base_url = "https://developer.nrel.gov/api/pvdaq/v3/data_file?"
         param_list = [str(item[0]) + "=" + str(item[1]) for item in req_params.items()]
         req_url = base_url + "&".join(param_list)
-        response = requests.get(req_url)
-        if int(response.status_code) != 200:
-            print("\n error: ", response.status_code)
-            return
-        df = pd.read_csv(StringIO(response.text), delimiter=delim)
-        df_list.append(df)
-        it += 1
+        # Stream the response body into the CSV parser rather than decoding
+        # the full file into a string first
+        with requests.get(req_url, stream=True) as response:
+            if int(response.status_code) != 200:
+                return response.status_code, None
+            response.raw.decode_content = True
+            df = pd.read_csv(response.raw, delimiter=delim, engine=csv_engine)
+        return response.status_code, df
+
+    df_list = [None] * len(year)
+    it = 0
+    progress(it, len(year), "querying {} year(s)".format(len(year)))
+    # The executor is shut down without waiting, so that an error is returned
+    # without waiting for the downloads of the other years still in flight
+    executor = ThreadPoolExecutor(max_workers=min(len(year), 8))
+    futures = {executor.submit(query_year, yr): ix for ix, yr in enumerate(year)}
+    try:
+        for future in as_completed(futures):
+            status_code, df = future.result()
+            if int(status_code) != 200:
+                print("\n error: ", status_code)
+                return
+            df_list[futures[future]] = df
+            it += 1
+            progress(it, len(year), "received year {}".format(year[futures[future]]))
+    finally:
+        for f in futures:
+            f.cancel()
+        executor.shutdown(wait=False)
     tf = time()
     progress(it, len(year), "queries complete in {:.1f} seconds       ".format(tf - ti))
     # concatenate the list of yearly data frames
@@ -126,6 +154,11 @@ def load_pvo_data(
     return df
 
 
+# Open Cassandra connections and prepared statements, keyed by cluster IP
+_cassandra_sessions = {}
+_cassandra_statements = {}
+
+
 def load_cassandra_data(
     siteid,
     column="ac_power",
@@ -143,7 +176,8 @@ def load_cassandra_data(
     )
 
     try:
-        from cassandra.cluster import Cluster
+        from cassandra.cluster import Cluster, NoHostAvailable
+        from cassandra.query import tuple_factory
     except ImportError:
         print(
             "Please install cassandra-driver in your Python environment to use this function"
@@ -161,32 +195,65 @@ def load_cassandra_data(
             msg += "~/.aws/cassander_cluster or provide your own IP address"
             print(msg)
             return
-    cluster = Cluster([cluster_ip])
-    session = cluster.connect("measurements")
+    # Connecting involves cluster metadata discovery, so the session is kept
+    # open and reused by later calls against the same cluster
+    try:
+        cluster, session = _cassandra_sessions[cluster_ip]
+    except KeyError:
+        cluster = Cluster([cluster_ip])
+        session = cluster.connect("measurements")
+        # Plain tuples are cheaper to build than named rows, and the columns
+        # are known from the query
+        session.row_factory = tuple_factory
+        _cassandra_sessions[cluster_ip] = (cluster, session)
+    # Values are bound by the driver rather than formatted into the query
+    # text, so the statement only depends on which constraints are present
+    # and can be prepared once per session.
     cql = """
         select site, meas_name, ts, sensor, meas_val_f
         from measurement_raw
-        where site = '{}'
-            and meas_name = '{}'
-    """.format(
-        siteid, column
-    )
-    ts_constraint = np.logical_or(tmin is not None, tmax is not None)
+        where site = ?
+            and meas_name = ?
+    """
+    params = [str(siteid), str(column)]
+    ts_constraint = tmin is not None or tmax is not None
     if tmin is not None:
-        cql += "and ts > '{}'\n".format(tmin)
+        cql += "and ts > ?\n"
+        params.append(pd.Timestamp(tmin).to_pydatetime())
     if tmax is not None:
-        cql += "and ts < '{}'\n".format(tmax)
+        cql += "and ts < ?\n"
+        params.append(pd.Timestamp(tmax).to_pydatetime())
     if sensor is not None and ts_constraint:
-        cql += "and sensor = '{}'\n".format(sensor)
+        cql += "and sensor = ?\n"
+        params.append(str(sensor))
     elif sensor is not None and not ts_constraint:
         cql += "and ts > '2000-01-01'\n"
-        cql += "and sensor = '{}'\n".format(sensor)
+        cql += "and sensor = ?\n"
+        params.append(str(sensor))
     if limit is not None:
-        cql += "limit {}".format(np.int(limit))
+        cql += "limit ?"
+        params.append(int(limit))
     cql += ";"
-    rows = session.execute(cql)
-    df = pd.DataFrame(list(rows))
-    df.replace(-999999.0, np.NaN, inplace=True)
+    try:
+        try:
+            statement = _cassandra_statements[(cluster_ip, cql)]
+        except KeyError:
+            statement = session.prepare(cql)
+            _cassandra_statements[(cluster_ip, cql)] = statement
+        rows = session.execute(statement, params)
+    except NoHostAvailable:
+        # The cluster is unreachable, so drop the cached connection and its
+        # statements and reconnect on the next call
+        del _cassandra_sessions[cluster_ip]
+        for key in [key for key in _cassandra_statements if key[0] == cluster_ip]:
+            del _cassandra_statements[key]
+        cluster.shutdown()
+        raise
+    df = pd.DataFrame.from_records(
+        rows, columns=["site", "meas_name", "ts", "sensor", "meas_val_f"]
+    )
+    values = df["meas_val_f"].to_numpy(dtype=float)
+    df["meas_val_f"] = np.where(values == -999999.0, np.nan, values)
     tf = time()
     if verbose:
         print("Query of {} rows complete in {:.2f} seconds".format(len(df), tf - ti))
@@ -223,6 +290,102 @@ def load_constellation_data(
     return df
 
 
+class QueryParams(TypedDict):
+    api_key: str
+    siteid: str
+    column: str
+    sensor: int | list[int] | None
+    tmin: datetime | None
+    tmax: datetime | None
+    limit: int | None
+
+
+def _timing(func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(*args, verbose: bool = False, **kwargs):
+        start_time = perf_counter()
+        result = func(*args, verbose=verbose, **kwargs)
+        end_time = perf_counter()
+        execution_time = end_time - start_time
+        if verbose:
+            print(f"{func.__name__} took {execution_time:.3f} seconds to run")
+        return result
+
+    return wrapper
+
+
+def _decompress_data_to_dataframe(encoded_data) -> pd.DataFrame:
+    # Decode the data
+    decoded_data = base64.b64decode(encoded_data)
+
+    # Decompress the data
+    decompressed_data = zlib.decompress(decoded_data).decode("utf-8")
+
+    # Attempt to read the decompressed data as CSV
+    df = pd.read_csv(StringIO(decompressed_data))
+
+    return df
+
+
+def _query_payload(params: QueryParams) -> dict:
+    payload = {
+        "api_key": params.get("api_key"),
+        "siteid": params.get("siteid"),
+        "column": params.get("column"),
+        "sensor": params.get("sensor"),
+        "tmin": str(params.get("tmin")),
+        "tmax": str(params.get("tmax")),
+        "limit": str(params.get("limit")),
+    }
+    for key in ["sensor", "tmin", "tmax", "limit"]:
+        if params.get(key) is None:
+            payload.pop(key)
+    return payload
+
+
+@_timing
+def _query_redshift_w_api(
+    params: QueryParams, page: int, is_batch: bool = False, verbose: bool = False
+) -> requests.Response:
+    url = "https://api.pvdb.slacgismo.org/v1/query"
+    payload = _query_payload(params)
+    payload["page"] = str(page)
+    payload["is_batch"] = str(is_batch)
+
+    response = requests.post(
+        url, json=payload, timeout=60 * 5, headers={"Accept-Encoding": "gzip"}
+    )
+
+    if response.status_code != 200:
+        error = response.json()
+        error_msg = error["error"]
+        raise Exception(
+            f"Query failed with status code {response.status_code}: {error_msg}"
+        )
+    if verbose:
+        print(f"Content size: {len(response.content)}")
+
+    return response
+
+
+@_timing
+def _get_query_info(params: QueryParams, verbose: bool = False) -> requests.Response:
+    url = "https://api.pvdb.slacgismo.org/v1/query/info/"
+    payload = _query_payload(params)
+
+    response = requests.post(url, json=payload, timeout=60 * 5)
+
+    if response.status_code != 200:
+        error = response.json()
+        print(error)
+        error_msg = error["error"]
+        raise Exception(
+            f"Query failed with status code {response.status_code}: {error_msg}"
+        )
+
+    return response
+
+
 def load_redshift_data(
     siteid: str,
     api_key: str,
@@ -258,124 +421,15 @@ def load_redshift_data(
     :rtype: pd.DataFrame
     """
 
-    class QueryParams(TypedDict):
-        api_key: str
-        siteid: str
-        column: str
-        sensor: int | list[int] | None
-        tmin: datetime | None
-        tmax: datetime | None
-        limit: int | None
-
-    def decompress_data_to_dataframe(encoded_data):
-        # Decode the data
-        decoded_data = base64.b64decode(encoded_data)
-
-        # Decompress the data
-        decompressed_data = zlib.decompress(decoded_data).decode("utf-8")
-
-        # Attempt to read the decompressed data as CSV
-        df = pd.read_csv(StringIO(decompressed_data))
-
-        return df
-
-    def timing(verbose: bool = True) -> Callable:
-        def decorator(func: Callable):
-            @wraps(func)
-            def wrapper(*args, **kwargs):
-                start_time = perf_counter()
-                result = func(*args, **kwargs)
-                end_time = perf_counter()
-                execution_time = end_time - start_time
-                if verbose:
-                    print(f"{func.__name__} took {execution_time:.3f} seconds to run")
-                return result
-
-            return wrapper
-
-        return decorator
-
-    @timing(verbose)
-    def query_redshift_w_api(
-        params: QueryParams, page: int, is_batch: bool = False
-    ) -> requests.Response:
-        url = "https://api.pvdb.slacgismo.org/v1/query"
-        payload = {
-            "api_key": params.get("api_key"),
-            "siteid": params.get("siteid"),
-            "column": params.get("column"),
-            "sensor": params.get("sensor"),
-            "tmin": str(params.get("tmin")),
-            "tmax": str(params.get("tmax")),
-            "limit": str(params.get("limit")),
-            "page": str(page),
-            "is_batch": str(is_batch),
-        }
-
-        if sensor is None:
-            payload.pop("sensor")
-        if tmin is None:
-            payload.pop("tmin")
-        if tmax is None:
-            payload.pop("tmax")
-        if limit is None:
-            payload.pop("limit")
-
-        response = requests.post(
-            url, json=payload, timeout=60 * 5, headers={"Accept-Encoding": "gzip"}
-        )
-
-        if response.status_code != 200:
-            error = response.json()
-            error_msg = error["error"]
-            raise Exception(
-                f"Query failed with status code {response.status_code}: {error_msg}"
-            )
-        if verbose:
-            print(f"Content size: {len(response.content)}")
-
-        return response
-
-    @timing(verbose)
-    def get_query_info(params: QueryParams) -> requests.Response:
-        url = "https://api.pvdb.slacgismo.org/v1/query/info/"
-        payload = {
-            "api_key": params.get("api_key"),
-            "siteid": params.get("siteid"),
-            "column": params.get("column"),
-            "sensor": params.get("sensor"),
-            "tmin": str(params.get("tmin")),
-            "tmax": str(params.get("tmax")),
-            "limit": str(params.get("limit")),
-        }
-
-        if sensor is None:
-            payload.pop("sensor")
-        if tmin is None:
-            payload.pop("tmin")
-        if tmax is None:
-            payload.pop("tmax")
-        if limit is None:
-            payload.pop("limit")
-
-        response = requests.post(url, json=payload, timeout=60 * 5)
-
-        if response.status_code != 200:
-            error = response.json()
-            print(error)
-            error_msg = error["error"]
-            raise Exception(
-                f"Query failed with status code {response.status_code}: {error_msg}"
-            )
-
-        return response
-
     def fetch_data(
-        query_params: QueryParams, df_list: list[pd.DataFrame], index: int, page: int
+        query_params: QueryParams,
+        df_list: list[pd.DataFrame | None],
+        index: int,
+        page: int,
     ):
         try:
-            response = query_redshift_w_api(query_params, page)
-            new_df = decompress_data_to_dataframe(response.content)
+            response = _query_redshift_w_api(query_params, page, verbose=verbose)
+            new_df = _decompress_data_to_dataframe(response.content)
 
             if new_df.empty:
                 raise Exception("Empty dataframe returned from query")
@@ -387,8 +441,6 @@ def load_redshift_data(
             print(e)
             # raise e
 
-    import threading
-
     data: Dict[str, Any] = {}
 
     query_params: QueryParams = {
@@ -402,7 +454,7 @@ def load_redshift_data(
     }
 
     try:
-        batch_df: requests.Response = get_query_info(query_params)
+        batch_df: requests.Response = _get_query_info(query_params, verbose=verbose)
         data = batch_df.json()
     except Exception as e:
         print(e)
@@ -425,17 +477,16 @@ def load_redshift_data(
 
     running_count = total_count
     page = 0
-    df = pd.DataFrame()
     list_of_dfs: list[pd.DataFrame] = []
     for _ in range(loops):
-        df_list = [pd.DataFrame() for _ in range(batch_size)]
+        df_list: list[pd.DataFrame | None] = [None] * batch_size
         page_batch = list(range(page, page + batch_size))
         threads: list[threading.Thread] = []
 
         # Create threads for each batch of pages
         for i in range(len(page_batch)):
             query_params_copy = query_params.copy()
-            if running_count < max_limit:
+            if limit is not None and running_count < max_limit:
                 query_params_copy["limit"] = running_count
             thread = threading.Thread(
                 target=fetch_data, args=(query_params_copy, df_list, i, page_batch[i])
@@ -453,7 +504,7 @@ def load_redshift_data(
         page += batch_size
 
         # Concatenate the dataframes
-        valid_df_list = [new_df for new_df in df_list if not new_df.empty]
+        valid_df_list = [new_df for new_df in df_list if new_df is not None]
 
         list_of_dfs.extend(valid_df_list)
 
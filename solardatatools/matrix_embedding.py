@@ -33,7 +33,8 @@ def make_2d(
 
     :param df: A pandas data frame contained tabular data with a standardized time axis.
     :param key: The key corresponding to the column in the data frame contained the signal to make into a matrix
-    :return: A 2D numpy array with shape (measurements per day, days in data set)
+    :return: A 2D numpy array with shape (measurements per day, days in data set),
+        stored in C order (consecutive days are adjacent in memory)
     """
     if df is not None:
         days = df.resample("D").first().index
@@ -52,11 +53,15 @@ def make_2d(
             end = days[-1].strftime("%Y-%m-%d")
         else:
             end = days[-2].strftime("%Y-%m-%d")
-        D = np.copy(df[key].loc[start:end].values.reshape(n_steps, -1, order="F"))
+        # Build the matrix in C order with days along the last axis, so that
+        # daily reductions over the first axis (e.g. np.sum(D, axis=0)) read
+        # contiguous memory
+        arr = df[key].loc[start:end].to_numpy()
+        D = np.ascontiguousarray(arr.reshape(-1, n_steps).T)
         # Trim leading or trailing missing days, which can occur when data frame
         # contains data from multiple sources or sensors that have missing
         # values at different times.
-        empty_days = np.alltrue(np.isnan(D), axis=0)
+        empty_days = np.all(np.isnan(D), axis=0)
         i, j = find_start_end(empty_days)
         D = D[:, i:j]
         day_axis = pd.date_range(start=start, end=end, freq="1D")
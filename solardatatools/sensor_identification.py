@@ -40,7 +40,7 @@ class SensorIdentification:
             return
         self.coverage_scores = self.data_handler.extra_quality_scores
         nan_masks = [~np.isnan(m[1]) for m in self.data_handler.extra_matrices.items()]
-        self.compare_mask = np.alltrue(np.array(nan_masks), axis=0)
+        self.compare_mask = np.all(np.array(nan_masks), axis=0)
         # These attributes are set when running the identify method
         self.results_table = None
         self.chosen_sensor = None
@@ -40,6 +40,7 @@ from solardatatools._cvx_signal_decompositions import (
     _cvx_tl1_l2d2p365,
     _cvx_l2_l1d2_constrained,
 )
+from solardatatools._fast_signal_decompositions import _fast_l1_l1d1_l2d2p365
 
 
 def l2_l1d1_l2d2p365(
@@ -205,6 +206,8 @@ def l1_l1d1_l2d2p365(
     Used in solardatatools/algorithms/capacity_change.py
 
     This is a nonconvex problem when invoking QSS, and convex when invoking MOSEK.
+    FAST solves the convex problem with iterative reweighting using a
+    specialized ADMM solver, without going through CVXPY or OSD.
 
     :param signal: A 1d numpy array (must support boolean indexing) containing
     the signal of interest
@@ -217,13 +220,26 @@ def l1_l1d1_l2d2p365(
     seasonal signal
     :param return_all: Returns all components and the objective value. Used for tests.
     :param solver: Solver to use for the decomposition. QSS and OSQP are supported with
-    OSD. MOSEK will trigger CVXPY use.
+    OSD. MOSEK will trigger CVXPY use. FAST uses the specialized solver, with the
+    weights rescaled by the ratio of its default weights to the ones above.
     :param sum_card: Boolean for using the nonconvex formulation using the cardinality penalty,
     Supported only using OSD with the QSS solver.
     :param verbose: Sets verbosity
     :return: A tuple with three 1d numpy arrays containing the three signal component estimates
     """
-    if solver == "MOSEK":
+    if solver == "FAST":
+        # FAST uses unscaled weights; the scaled weights are applied relative
+        # to their defaults so that tuning them has the same relative effect
+        res = _fast_l1_l1d1_l2d2p365(
+            signal=signal,
+            use_ixs=use_ixs,
+            w0=3 * w0 / 2e-6,
+            w1=18 * w1 / 40e-6,
+            w2=6000 * w2 / 6e-3,
+            return_all=return_all,
+            verbose=verbose,
+        )
+    elif solver == "MOSEK":
         # MOSEK weights set in CVXPY function
         res = _cvx_l1_l1d1_l2d2p365(
             signal=signal, use_ixs=use_ixs, return_all=return_all, verbose=verbose
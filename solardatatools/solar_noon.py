@@ -26,16 +26,14 @@ def energy_com(data):
     :param data: PV power matrix as generated by `make_2d` from `solardatatools.data_transforms`
     :return: A 1-D array, containing the solar noon estimate for each day in the data set
     """
-    data = np.copy(data)
-    data[np.isnan(data)] = 0
-    num_meas_per_hour = data.shape[0] / 24
-    x = np.arange(0, 24, 1.0 / num_meas_per_hour)
-    div1 = np.dot(x, data)
-    div2 = np.sum(data, axis=0)
-    com = np.empty_like(div1)
-    com[:] = np.nan
-    msk = div2 != 0
-    com[msk] = np.divide(div1[msk], div2[msk])
+    data = np.where(np.isnan(data), 0, data)
+    # hour of day of each row, and a row of ones to get the daily energy in
+    # the same pass over the data
+    x = np.arange(data.shape[0]) * (24 / data.shape[0])
+    weights = np.vstack([x, np.ones_like(x)])
+    div1, div2 = weights @ data
+    com = np.full_like(div1, np.nan)
+    np.divide(div1, div2, out=com, where=div2 != 0)
     return com
 
 
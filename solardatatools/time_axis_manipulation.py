@@ -9,7 +9,6 @@ This module contains functions for transforming PV power data, including time-ax
 from datetime import timedelta
 import numpy as np
 import pandas as pd
-from collections import Counter
 from typing import Optional
 
 TZ_LOOKUP = {
@@ -123,9 +122,7 @@ def standardize_time_axis(
             df[datetimekey] = pd.to_datetime(df[datetimekey])
             df.set_index(datetimekey, inplace=True)
         except KeyError:
-            time_cols = [
-                col for col in df.columns if np.logical_or("Time" in col, "time" in col)
-            ]
+            time_cols = [col for col in df.columns if "Time" in col or "time" in col]
             key = time_cols[0]
             df[datetimekey] = pd.to_datetime(df[key])
             df.set_index(datetimekey, inplace=True)
@@ -186,20 +183,24 @@ def standardize_time_axis(
             print(m1)
         sn_deviation = 0
     # determine most common sampling frequency
+    diff = df.index[1:] - df.index[:-1]
     try:
-        diff = (df.index[1:] - df.index[:-1]).seconds
+        # seconds component of each time delta, as returned by
+        # TimedeltaIndex.seconds, without creating a Python int per element
+        diff = np.floor(diff.total_seconds().to_numpy()) % (24 * 60 * 60)
         # print('case 1')
     except AttributeError:
-        diff = df.index[1:] - df.index[:-1]
         diff /= np.timedelta64(1, "s")
         # print('case 2')
     diff = (np.round(diff / 10) * 10).astype(
         np.int64
     )  # Round to the nearest 10 seconds
-    # Find *all* common sampling frequencies
-    freq_counts = Counter(diff)
-    freq = freq_counts.most_common()[0][0]
-    deltas = [c[0] for c in freq_counts.most_common() if int(c[1] > 0.05 * len(df))]
+    # Find *all* common sampling frequencies, ordered by count and then by
+    # first appearance
+    values, first_ixs, counts = np.unique(diff, return_index=True, return_counts=True)
+    order = np.lexsort((first_ixs, -counts))
+    freq = values[order[0]]
+    deltas = values[order][counts[order] > 0.05 * len(df)].tolist()
     if len(deltas) > 1:
         if verbose:
             print("CAUTION: Multiple scan rates detected!")
@@ -231,19 +232,28 @@ def standardize_time_axis(
     time_index = pd.date_range(
         start=start.date(), end=end.date() + timedelta(days=1), freq="{}s".format(freq)
     )[:-1]
+    # Match the resolution of the data index so that reindexing does not
+    # convert the full data index to the resolution of the new index
+    try:
+        index_unit = time_index.unit
+        time_index = time_index.as_unit(df.index.unit)
+    except AttributeError:
+        # pandas < 2.0 only has nanosecond resolution
+        index_unit = None
     # This forces the existing data into the closest new timestamp to the
     # old timestamp.
     try:
         df = df.loc[df.index.notnull()]
         df = df.loc[~df.index.duplicated()]
-        df = df.loc[df.index.notnull()].reindex(
-            index=time_index, method="nearest", limit=1
-        )
+        df = df.reindex(index=time_index, method="nearest", limit=1)
     except TypeError:
         df.index = df.index.tz_localize(None)
         df = df.loc[df.index.notnull()].reindex(
             index=time_index, method="nearest", limit=1
         )
+    if index_unit is not None:
+        # Return the standardized index at its original resolution
+        df.index = df.index.as_unit(index_unit)
     return df, sn_deviation
 
 
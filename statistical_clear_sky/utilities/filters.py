@@ -4,7 +4,7 @@ import cvxpy as cvx
 
 def lowpass_2d(data, r=25):
     fs = np.fft.fft2(data)
-    fltr = np.zeros_like(data, dtype=np.float)
+    fltr = np.zeros_like(data, dtype=float)
     m, n = data.shape
     c = (m // 2, n // 2)
     if m % 2 == 0:
@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from solardatatools.algorithms.capacity_change import CapacityChange, _daily_quantile
+
+
+class TestDailyQuantile(unittest.TestCase):
+    def test_daily_quantile_matches_nanquantile(self):
+        np.random.seed(42)
+        data = np.random.uniform(size=(96, 50))
+        data[np.random.uniform(size=data.shape) < 0.3] = np.nan
+        for q in [0.0, 0.05, 0.5, 0.9, 1.0]:
+            expected_output = np.nanquantile(data, q=q, axis=0)
+            actual_output = _daily_quantile(data, q)
+            np.testing.assert_array_almost_equal(expected_output, actual_output)
+
+    def test_daily_quantile_int_input(self):
+        np.random.seed(42)
+        data = np.random.randint(0, 1000, size=(96, 50))
+        for q in [0.0, 0.5, 1.0]:
+            expected_output = np.nanquantile(data, q=q, axis=0)
+            actual_output = _daily_quantile(data, q)
+            self.assertEqual(actual_output.dtype, np.float64)
+            np.testing.assert_array_almost_equal(expected_output, actual_output)
+
+
+class TestCapacityChange(unittest.TestCase):
+    def test_capacity_change_fast_solver(self):
+        np.random.seed(42)
+        num_days = 730
+        profile = np.clip(np.sin(np.linspace(0, np.pi, 96)), 0, None)
+        capacity = np.ones(num_days)
+        capacity[400:] = 0.7
+        seasonal = 1 + 0.05 * np.sin(2 * np.pi * np.arange(num_days) / 365)
+        data = np.outer(profile, capacity * seasonal)
+        data *= 1 + 0.01 * np.random.normal(size=data.shape)
+        cc = CapacityChange()
+        cc.run(data, solver="FAST")
+        labels = np.asarray(cc.labels)
+        self.assertEqual(len(set(labels)), 2)
+        self.assertTrue(np.all(labels[:400] == labels[0]))
+        self.assertTrue(np.all(labels[400:] == labels[-1]))
+
+
+if __name__ == "__main__":
+    unittest.main()